@@ -2,7 +2,11 @@
 File Upload API Endpoints
 """
 import logging
-from typing import Dict
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, IO
+import anyio
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from werkzeug.utils import secure_filename
 
@@ -12,10 +16,24 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Accepted upload extensions (lowercase, including the dot)
+ALLOWED_EXTENSIONS = frozenset({'.pdf', '.pptx'})
+
+# Uploads at or below this size are processed straight from memory
+# (matches Starlette's spool threshold, so the bytes never hit disk)
+IN_MEMORY_LIMIT = 1 << 20
+
 # Initialize document service
 document_service = DocumentService()
 
 
+def _save_upload(source: IO[bytes], file_path: Path) -> None:
+    """Copy an uploaded file to disk in 1 MiB chunks (runs in a worker thread)"""
+    chunk_size = 1 << 20
+    with open(file_path, "wb", buffering=chunk_size) as f:
+        shutil.copyfileobj(source, f, length=chunk_size)
+
+
 @router.post("/file")
 async def upload_file(file: UploadFile = File(...)) -> Dict:
     """
@@ -27,28 +45,33 @@ async def upload_file(file: UploadFile = File(...)) -> Dict:
             raise HTTPException(status_code=400, detail="No file provided")
         
         # Check file extension
-        allowed_extensions = {'.pdf', '.pptx'}
-        file_ext = '.' + file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        
-        if file_ext not in allowed_extensions:
+        file_ext = os.path.splitext(file.filename)[1].lower()
+
+        if file_ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
+                detail=f"Invalid file type. Allowed types: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
             )
         
-        # Save file
         filename = secure_filename(file.filename)
-        file_path = settings.UPLOAD_FOLDER / filename
-        
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        logger.info(f"File uploaded: {filename}")
-        
-        # Extract text and generate questions
-        questions = await document_service.process_document(file_path)
-        
+
+        if file.size is not None and file.size <= IN_MEMORY_LIMIT:
+            # Small upload: extract directly from the in-memory bytes
+            data = await file.read()
+            logger.info(f"File processed in memory: {filename}")
+            questions = await document_service.process_document_bytes(data, file_ext)
+        else:
+            # Large upload: save to disk first
+            file_path = settings.UPLOAD_FOLDER / filename
+
+            # Write in a worker thread so disk I/O never blocks the event loop
+            await anyio.to_thread.run_sync(_save_upload, file.file, file_path)
+
+            logger.info(f"File uploaded: {filename}")
+
+            # Extract text and generate questions
+            questions = await document_service.process_document(file_path)
+
         return {"questions": questions}
         
     except HTTPException:
@@ -3,11 +3,12 @@ Video Generation API Endpoints
 """
 import logging
 import os
+import time
 from typing import List
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, ORJSONResponse
 
-from app.schemas.video import VideoGenerationRequest, VideoGenerationResponse, VideoListResponse
+from app.schemas.video import VideoGenerationRequest, VideoGenerationResponse
 from app.services.video_service import VideoGenerationService
 from app.core.config import settings
 
@@ -17,12 +18,54 @@ router = APIRouter()
 # Initialize video service
 video_service = VideoGenerationService()
 
+# Cached directory listing: (expires_at, dir_mtime_ns, videos)
+_LIST_CACHE_TTL = 5.0
+_list_cache = None
+
+# Recognized video file extensions (lowercase, without the dot)
+VIDEO_EXTENSIONS = frozenset({'mp4', 'webm', 'ogg', 'mov', 'avi'})
+
+
+class VideoFileResponse(FileResponse):
+    """FileResponse with a 1 MiB chunk size for fewer syscalls on large files"""
+    chunk_size = 1 << 20
+
+
+def _list_videos_cached(video_dir) -> List[dict]:
+    """List videos, memoized for a few seconds and keyed on directory mtime"""
+    global _list_cache
+    now = time.monotonic()
+    mtime_ns = os.stat(video_dir).st_mtime_ns
+
+    if _list_cache is not None:
+        expires_at, cached_mtime_ns, cached_videos = _list_cache
+        if now < expires_at and mtime_ns == cached_mtime_ns:
+            return cached_videos
+
+    videos = []
+    with os.scandir(video_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            ext = entry.name.rsplit('.', 1)[-1].lower()
+            if ext in VIDEO_EXTENSIONS:
+                videos.append({
+                    "name": entry.name,
+                    "path": f"/static/videos/{entry.name}"
+                })
+
+    _list_cache = (now + _LIST_CACHE_TTL, mtime_ns, videos)
+    return videos
+
+
+def invalidate_list_cache():
+    """Drop the cached video listing so new videos appear immediately"""
+    global _list_cache
+    _list_cache = None
+
 
 @router.post("/generate", response_model=VideoGenerationResponse)
-async def generate_video(
-    request: VideoGenerationRequest,
-    background_tasks: BackgroundTasks
-):
+async def generate_video(request: VideoGenerationRequest):
     """
     Generate a video based on the provided parameters.
     This endpoint triggers the full video generation pipeline:
@@ -34,9 +77,9 @@ async def generate_video(
     """
     try:
         logger.info(f"Received video generation request for topic: {request.topic}")
-        
-        # Generate video (runs in background)
-        result = await video_service.generate_video_async(request, background_tasks)
+
+        # Generate video (queued on the persistent worker)
+        result = await video_service.generate_video_async(request)
         
         return result
         
@@ -45,27 +88,16 @@ async def generate_video(
         raise HTTPException(status_code=500, detail=f"Video generation failed: {str(e)}")
 
 
-@router.get("/list", response_model=List[VideoListResponse])
+@router.get("/list", response_class=ORJSONResponse)
 async def list_videos():
     """
     List all generated videos in the static/videos directory
     """
     try:
-        video_dir = settings.STATIC_DIR / "videos"
-        
-        if not video_dir.exists():
-            return []
-        
-        videos = []
-        for filename in os.listdir(video_dir):
-            if filename.lower().endswith(('.mp4', '.webm', '.ogg', '.mov', '.avi')):
-                videos.append(VideoListResponse(
-                    name=filename,
-                    path=f"/static/videos/{filename}"
-                ))
-        
-        return videos
-        
+        return _list_videos_cached(settings.STATIC_DIR / "videos")
+
+    except FileNotFoundError:
+        return []
     except Exception as e:
         logger.error(f"Failed to list videos: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to list videos: {str(e)}")
@@ -78,16 +110,19 @@ async def download_video(video_name: str):
     """
     try:
         video_path = settings.STATIC_DIR / "videos" / video_name
-        
-        if not video_path.exists():
+
+        try:
+            stat_result = os.stat(video_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Video not found")
-        
-        return FileResponse(
+
+        return VideoFileResponse(
             path=video_path,
             media_type="video/mp4",
-            filename=video_name
+            filename=video_name,
+            stat_result=stat_result
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -102,15 +137,18 @@ async def stream_video(video_name: str):
     """
     try:
         video_path = settings.STATIC_DIR / "videos" / video_name
-        
-        if not video_path.exists():
+
+        try:
+            stat_result = os.stat(video_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Video not found")
-        
-        return FileResponse(
+
+        return VideoFileResponse(
             path=video_path,
-            media_type="video/mp4"
+            media_type="video/mp4",
+            stat_result=stat_result
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -3,6 +3,7 @@ Application Configuration
 Loads all settings from environment variables
 """
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import List, Optional
 from pydantic_settings import BaseSettings
@@ -23,6 +24,7 @@ class Settings(BaseSettings):
     DEBUG: bool = Field(default=True, env="DEBUG")
     HOST: str = Field(default="0.0.0.0", env="HOST")
     PORT: int = Field(default=8000, env="PORT")
+    WORKERS: int = Field(default=1, env="WORKERS")
     
     # CORS
     CORS_ORIGINS: str = Field(
@@ -30,9 +32,9 @@ class Settings(BaseSettings):
         env="CORS_ORIGINS"
     )
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS_ORIGINS string into list"""
+        """Parse CORS_ORIGINS string into list (computed once)"""
         if isinstance(self.CORS_ORIGINS, str):
             return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
         return self.CORS_ORIGINS
@@ -87,9 +89,8 @@ class Settings(BaseSettings):
         "extra": "ignore"
     }
     
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        
+    def model_post_init(self, __context) -> None:
+        """Fill in derived paths once, after field validation"""
         # Initialize paths after base initialization
         if self.UPLOAD_FOLDER is None:
             self.UPLOAD_FOLDER = self.BASE_DIR / "uploads"
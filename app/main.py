@@ -10,6 +10,7 @@ from fastapi.responses import FileResponse
 
 from app.core.config import settings
 from app.api.v1 import router as api_router
+from app.api.v1.videos import video_service
 
 # Configure logging
 logging.basicConfig(
@@ -32,9 +33,13 @@ async def lifespan(app: FastAPI):
     
     # Ensure required directories exist
     settings.ensure_directories()
-    
+
+    # Start the persistent video generation worker
+    await video_service.start_worker()
+
     yield
-    
+
+    await video_service.stop_worker()
     logger.info("Shutting down FastAPI Video Generator...")
 
 
@@ -55,7 +60,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
+# Mount static files; videos get a dedicated mount so range/ETag-handled
+# sendfile serving resolves without walking the general static tree
+app.mount("/static/videos", StaticFiles(directory=settings.STATIC_DIR / "videos", check_dir=False), name="videos")
 app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
 
 # Include API routes
@@ -84,5 +91,11 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        # uvloop + httptools (from uvicorn[standard]) outperform the
+        # stdlib event loop and h11 parser
+        loop="uvloop",
+        http="httptools",
+        # reload and multi-worker are mutually exclusive in uvicorn
+        workers=1 if settings.DEBUG else settings.WORKERS
     )
@@ -2,14 +2,15 @@
 Document Processing Service
 Handles PDF and PPTX file processing
 """
+import io
 import logging
 import json
-import re
 from pathlib import Path
-from typing import List
+from typing import List, Union
+import anyio
 import fitz  # PyMuPDF
 import pptx
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from app.core.config import settings
 
@@ -20,60 +21,104 @@ class DocumentService:
     """Service for processing documents and extracting questions"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     
-    def _extract_text_from_pdf(self, pdf_path: Path, max_chars: int = 2000) -> str:
-        """Extract text from PDF file"""
-        text = ""
-        with fitz.open(pdf_path) as doc:
-            for page in doc:
-                text += page.get_text()
-                if len(text) > max_chars:
+    def _extract_text_from_pdf(self, source: Union[Path, bytes], max_chars: int = 2000, max_pages: int = 10) -> str:
+        """Extract text from a PDF file path or in-memory bytes"""
+        parts = []
+        total = 0
+        if isinstance(source, bytes):
+            doc = fitz.open(stream=source, filetype="pdf")
+        else:
+            # filetype="pdf" skips fitz's format sniffing, and the character
+            # budget never needs more than the first few pages
+            doc = fitz.open(source, filetype="pdf")
+        with doc:
+            for page in doc.pages(0, min(doc.page_count, max_pages)):
+                # Block-level extraction lets us stop mid-page once the
+                # character budget is reached
+                for block in page.get_text("blocks"):
+                    # Skip image blocks - their "text" is a placeholder
+                    # like "<image: DeviceRGB, ...>", not document content
+                    if block[6] != 0:
+                        continue
+                    block_text = block[4]
+                    parts.append(block_text)
+                    total += len(block_text)
+                    if total > max_chars:
+                        break
+                if total > max_chars:
                     break
-        return text[:max_chars]
+        return "".join(parts)[:max_chars]
     
-    def _extract_text_from_ppt(self, ppt_path: Path, max_chars: int = 2000) -> str:
-        """Extract text from PowerPoint file"""
-        text = ""
-        prs = pptx.Presentation(ppt_path)
+    def _extract_text_from_ppt(self, source: Union[Path, bytes], max_chars: int = 2000) -> str:
+        """Extract text from a PowerPoint file path or in-memory bytes"""
+        parts = []
+        total = 0
+        prs = pptx.Presentation(io.BytesIO(source) if isinstance(source, bytes) else source)
         for slide in prs.slides:
             for shape in slide.shapes:
                 if hasattr(shape, "text"):
-                    text += shape.text + "\n"
-                    if len(text) > max_chars:
+                    parts.append(shape.text + "\n")
+                    total += len(parts[-1])
+                    if total > max_chars:
                         break
-        return text[:max_chars]
+            if total > max_chars:
+                break
+        return "".join(parts)[:max_chars]
     
     def _extract_json_from_text(self, text: str) -> dict:
-        """Extract JSON from text response"""
+        """Parse the JSON response (guaranteed well-formed by json_object mode)"""
         try:
-            match = re.search(r"\{.*\}", text, re.DOTALL)
-            return json.loads(match.group()) if match else json.loads(text)
+            return json.loads(text)
         except Exception:
             return None
     
-    def _ask_openai(self, prompt: str) -> str:
-        """Query OpenAI API"""
-        response = self.client.chat.completions.create(
+    async def _ask_openai(self, prompt: str) -> str:
+        """Query OpenAI API, streaming tokens as they are generated"""
+        stream = await self.client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
+            response_format={"type": "json_object"},
+            stream=True,
         )
-        return response.choices[0].message.content
+        # Accumulating deltas as they arrive avoids waiting for the full
+        # completion to be buffered server-side before we see any of it
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        return "".join(parts)
     
+    def _extract_text(self, source: Union[Path, bytes], suffix: str) -> str:
+        """Extract text from a document given its extension"""
+        if suffix == '.pdf':
+            return self._extract_text_from_pdf(source)
+        elif suffix == '.pptx':
+            return self._extract_text_from_ppt(source)
+        else:
+            raise ValueError(f"Unsupported file type: {suffix}")
+
     async def process_document(self, file_path: Path) -> List[str]:
         """
         Process document and extract questions
         """
+        return await self._process(file_path, file_path.suffix.lower())
+
+    async def process_document_bytes(self, data: bytes, suffix: str) -> List[str]:
+        """
+        Process an in-memory document and extract questions
+        Avoids the disk round-trip for small uploads
+        """
+        return await self._process(data, suffix.lower())
+
+    async def _process(self, source: Union[Path, bytes], suffix: str) -> List[str]:
         try:
-            # Extract text based on file type
-            if file_path.suffix.lower() == '.pdf':
-                text = self._extract_text_from_pdf(file_path)
-            elif file_path.suffix.lower() == '.pptx':
-                text = self._extract_text_from_ppt(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_path.suffix}")
-            
+            # Extract text in a worker thread - fitz/pptx parsing is
+            # CPU-bound and would otherwise block the event loop
+            text = await anyio.to_thread.run_sync(self._extract_text, source, suffix)
+
             # Generate questions using OpenAI
             prompt = f"""
             Generate 5 Yes/No questions from this text.
@@ -84,7 +129,7 @@ class DocumentService:
             {text}
             """
             
-            raw_response = self._ask_openai(prompt)
+            raw_response = await self._ask_openai(prompt)
             data = self._extract_json_from_text(raw_response)
             
             if data and "questions" in data:
@@ -3,13 +3,16 @@ Video Generation Service
 Orchestrates the entire video generation pipeline
 All paths are dynamically resolved from configuration
 """
+import asyncio
 import logging
 import json
+import os
 import time
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from fastapi import BackgroundTasks
+import anyio
 
 from app.schemas.video import VideoGenerationRequest, VideoGenerationResponse
 from app.core.config import settings
@@ -20,53 +23,93 @@ from assembly.scripts.assembly_video_refactored import create_video, create_comp
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in generated filenames
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9]")
+
 
 class VideoGenerationService:
     """Service for generating videos"""
     
     def __init__(self):
         self.script_generator = VideoScriptGenerator(api_key=settings.OPENAI_API_KEY)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker_task = None
+
+    async def start_worker(self):
+        """Start the persistent generation worker (called from app lifespan)"""
+        if self._worker_task is None:
+            self._worker_task = asyncio.create_task(self._worker())
+            logger.info("Video generation worker started")
+
+    async def stop_worker(self):
+        """Stop the generation worker (called from app lifespan)"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+            logger.info("Video generation worker stopped")
+
+    async def _worker(self):
+        """Pull generation jobs off the queue one at a time"""
+        while True:
+            request, video_filename = await self._queue.get()
+            try:
+                # The pipeline is blocking (moviepy, TTS), so run it in a
+                # worker thread to keep the event loop responsive
+                await anyio.to_thread.run_sync(
+                    self._generate_video_task, request, video_filename
+                )
+                # Imported here to avoid a circular import with the router
+                from app.api.v1.videos import invalidate_list_cache
+                invalidate_list_cache()
+            except Exception as e:
+                logger.error(f"Video generation job failed: {str(e)}", exc_info=True)
+            finally:
+                self._queue.task_done()
     
     def _clean_directory(self, folder_path: Path):
         """Clean all files in a directory"""
         if not folder_path.exists():
             return
-        
-        for item in folder_path.iterdir():
-            try:
-                if item.is_file():
-                    item.unlink()
-                elif item.is_dir():
-                    shutil.rmtree(item)
-            except Exception as e:
-                logger.warning(f"Failed to delete {item}: {e}")
+
+        # Remove the whole tree in one pass and recreate it, instead of
+        # unlinking entries one by one from Python
+        try:
+            shutil.rmtree(folder_path)
+        except Exception as e:
+            logger.warning(f"Failed to clean {folder_path}: {e}")
+        folder_path.mkdir(parents=True, exist_ok=True)
     
+    @staticmethod
+    def _clean_topic(topic: str) -> str:
+        """Sanitize a topic for use in filenames"""
+        return _UNSAFE_FILENAME_RE.sub("_", topic)[:30]
+
     def _generate_video_filename(self, topic: str) -> str:
         """Generate a clean filename from topic"""
-        clean_topic = re.sub(r"[^A-Za-z0-9]", "_", topic)[:30]
         timestamp = int(time.time())
-        return f"{clean_topic}_{timestamp}.mp4"
+        return f"{self._clean_topic(topic)}_{timestamp}.mp4"
     
     async def generate_video_async(
         self,
-        request: VideoGenerationRequest,
-        background_tasks: BackgroundTasks
+        request: VideoGenerationRequest
     ) -> VideoGenerationResponse:
         """
         Generate video asynchronously
-        Returns immediately with success status, actual generation happens in background
+        Returns immediately with success status, actual generation happens
+        on the persistent worker; queued jobs run one at a time so
+        concurrent requests no longer race over the shared working dirs
         """
         try:
             # Generate video filename
             video_filename = self._generate_video_filename(request.topic)
-            
-            # Add background task
-            background_tasks.add_task(
-                self._generate_video_task,
-                request,
-                video_filename
-            )
-            
+
+            # Enqueue for the worker
+            self._queue.put_nowait((request, video_filename))
+
             return VideoGenerationResponse(
                 success=True,
                 message="Video generation started. This may take several minutes.",
@@ -104,33 +147,36 @@ class VideoGenerationService:
                 key_points=request.key_points if request.key_points else None
             )
             
-            # Save script
+            # Save script (SCRIPT_DIR is created at startup by
+            # settings.ensure_directories)
             script_path = settings.SCRIPT_DIR / "script.json"
-            script_path.parent.mkdir(parents=True, exist_ok=True)
             self.script_generator.save_script(script, str(script_path))
             logger.info(f"Script saved to: {script_path}")
             
-            # Step 3: Generate images
-            logger.info("Generating images...")
-            main_generate_images(
-                script_path=script_path,
-                images_output_path=settings.IMAGES_DIR,
-                api_key=settings.OPENAI_API_KEY
-            )
-            logger.info("Images generated successfully")
-            
-            # Step 4: Generate audio
-            logger.info("Generating audio...")
-            main_generate_audio(
-                script_path=script_path,
-                audio_path=settings.AUDIO_DIR
-            )
-            logger.info("Audio generated successfully")
+            # Steps 3 + 4: Generate images and audio in parallel - both
+            # depend only on the script, and each is dominated by waiting
+            # (DALL-E API calls vs. TTS inference)
+            logger.info("Generating images and audio...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                images_future = executor.submit(
+                    main_generate_images,
+                    script_path=script_path,
+                    images_output_path=settings.IMAGES_DIR,
+                    api_key=settings.OPENAI_API_KEY
+                )
+                audio_future = executor.submit(
+                    main_generate_audio,
+                    script_path=script_path,
+                    audio_path=settings.AUDIO_DIR
+                )
+                images_future.result()
+                logger.info("Images generated successfully")
+                audio_future.result()
+                logger.info("Audio generated successfully")
             
             # Step 5: Generate subtitles
             logger.info("Generating subtitles...")
-            clean_topic = re.sub(r"[^A-Za-z0-9]", "_", request.topic)[:30]
-            srt_path = settings.SUBTITLE_OUTPUT_DIR / f"{clean_topic}.srt"
+            srt_path = settings.SUBTITLE_OUTPUT_DIR / f"{self._clean_topic(request.topic)}.srt"
             create_complete_srt(
                 script_folder=script_path,
                 audio_file_folder=settings.AUDIO_DIR,
@@ -154,10 +200,14 @@ class VideoGenerationService:
                 fps=settings.DEFAULT_VIDEO_FPS
             )
             
-            # Step 7: Copy to static directory
+            # Step 7: Link into static directory - a hard link avoids
+            # copying a multi-MB file; fall back to a copy if the static
+            # dir lives on another filesystem
             final_video_path = settings.STATIC_DIR / "videos" / video_filename
-            final_video_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy(temp_video_path, final_video_path)
+            try:
+                os.link(temp_video_path, final_video_path)
+            except OSError:
+                shutil.copy(temp_video_path, final_video_path)
             
             logger.info(f"Video generation complete: {video_filename}")
             
@@ -3,15 +3,35 @@ Video Assembly Module - Path-Agnostic Version
 Assembles final video from images, audio, and subtitles
 All paths are passed as parameters - no hardcoded paths
 """
+import hashlib
 import os
 import json
+import re
 import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 from moviepy import ImageClip, concatenate_videoclips, AudioFileClip, TextClip, CompositeVideoClip, vfx
-import pysrt
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+# First run of digits in a filename stem, for numeric sorting
+_NUMBER_RE = re.compile(r'\d+')
+
+# Placeholder images already rendered this run, keyed by their parameters
+_placeholder_cache = {}
+
+
+def _format_srt_time(seconds: float) -> str:
+    """Format seconds as an SRT timestamp (HH:MM:SS,mmm)."""
+    ms = round(seconds * 1000)
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
 
 def check_file_exists(file_path: Path) -> bool:
     """Check if a file exists at the specified path."""
@@ -29,6 +49,40 @@ def check_folder_exists(folder_path: Path) -> bool:
         raise FileNotFoundError(f"Folder not found at {folder_path}")
 
 
+@lru_cache(maxsize=256)
+def _probe_duration(audio_path: str, mtime_ns: int) -> float:
+    """Probe an audio file's duration with ffprobe (mtime keys the cache)."""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            audio_path
+        ],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def get_audio_duration(audio_path: Path) -> float:
+    """
+    Get an audio file's duration in seconds.
+
+    Probes with ffprobe, which reads only the header instead of opening
+    a full AudioFileClip; falls back to moviepy if ffprobe is missing.
+    """
+    audio_path = Path(audio_path)
+    try:
+        return _probe_duration(str(audio_path), audio_path.stat().st_mtime_ns)
+    except Exception as e:
+        print(f"ffprobe failed for {audio_path}, falling back to moviepy: {e}")
+        clip = AudioFileClip(str(audio_path))
+        try:
+            return clip.duration
+        finally:
+            clip.close()
+
+
 def get_files(folder: Path, extensions: tuple) -> List[Path]:
     """
     Retrieves files with specified extensions from a folder.
@@ -41,15 +95,19 @@ def get_files(folder: Path, extensions: tuple) -> List[Path]:
         List of file paths sorted numerically
     """
     folder = Path(folder)
-    
-    if not folder.is_dir():
+    extensions = tuple(ext.lower() for ext in extensions)
+
+    # scandir yields is_file() from the dirent, avoiding a stat per entry
+    try:
+        with os.scandir(folder) as entries:
+            files = [
+                folder / entry.name
+                for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions
+            ]
+    except FileNotFoundError:
         raise OSError(f"{folder} not found.")
-    
-    files = []
-    for file in folder.iterdir():
-        if file.is_file() and file.suffix.lower() in extensions:
-            files.append(file)
-    
+
     # Sort files numerically based on segment/scene number
     def extract_number(filepath: Path) -> int:
         try:
@@ -61,50 +119,58 @@ def get_files(folder: Path, extensions: tuple) -> List[Path]:
                 number_part = base.split('_')[1].split('-')[0]
             else:
                 # For other files, extract any number
-                import re
-                numbers = re.findall(r'\d+', base)
-                number_part = numbers[0] if numbers else '0'
+                match = _NUMBER_RE.search(base)
+                number_part = match.group() if match else '0'
             return int(number_part)
         except:
             return float('inf')  # Put files without numbers at the end
-    
+
     return sorted(files, key=extract_number)
 
 
-def extract_topic_from_json(file_path: Path) -> str:
-    """Extract topic from JSON file."""
+@lru_cache(maxsize=8)
+def _read_json(file_path: str, mtime_ns: int) -> dict:
+    """Parse a JSON file, cached per (path, mtime)."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def load_script_data(file_path: Path) -> Optional[dict]:
+    """
+    Load the script JSON once per run.
+
+    The topic, audio script, and subtitle extraction all read the same
+    file; the mtime-keyed cache means it is parsed a single time.
+    Returns None when the file is missing or invalid.
+    """
+    file_path = Path(file_path)
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            topic = data.get('topic', 'No topic found')
-            return topic
+        return _read_json(str(file_path), file_path.stat().st_mtime_ns)
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found.")
-        return "Unknown Topic"
+        return None
     except json.JSONDecodeError:
         print(f"Error: The file {file_path} contains invalid JSON.")
-        return "Unknown Topic"
+        return None
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+        return None
+
+
+def extract_topic_from_json(file_path: Path) -> str:
+    """Extract topic from JSON file."""
+    data = load_script_data(file_path)
+    if data is None:
         return "Unknown Topic"
+    return data.get('topic', 'No topic found')
 
 
 def extract_audio_from_json(file_path: Path) -> List[dict]:
     """Extract audio script from JSON file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            audio_script = data.get('audio_script', [])
-            return audio_script
-    except FileNotFoundError:
-        print(f"Error: The file {file_path} was not found.")
-        return []
-    except json.JSONDecodeError:
-        print(f"Error: The file {file_path} contains invalid JSON.")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+    data = load_script_data(file_path)
+    if data is None:
         return []
+    return data.get('audio_script', [])
 
 
 def json_extract(json_path: Path) -> List[str]:
@@ -125,10 +191,11 @@ def json_extract(json_path: Path) -> List[str]:
 def add_effects(clip):
     """Add fade in and fade out effects to the video clip."""
     try:
-        clip = clip.with_effects([vfx.FadeIn(duration=1)])
-        clip = clip.with_effects([vfx.FadeOut(duration=1)])
-        return clip
-    except Exception as e:
+        # One with_effects call applies both fades in a single clip copy
+        return clip.with_effects([vfx.FadeIn(duration=1), vfx.FadeOut(duration=1)])
+    except AttributeError as e:
+        # Only tolerate clips that don't support effects; anything else
+        # is a real failure and should surface
         print(f"Error adding effects: {e}")
         return clip
 
@@ -151,36 +218,26 @@ def create_intro_clip(
     Returns:
         VideoClip: A composite video clip with the background and centered text
     """
-    try:
-        check_file_exists(background_image_path)
-        
-        # Create background clip
-        background = ImageClip(str(background_image_path)).with_duration(duration)
-        
-        # Create text clip
-        text_clip = TextClip(
-            text=topic,
-            font_size=50,
-            color='white',
-            font=str(font_path),
-            stroke_color='black',
-            stroke_width=2
-        )
-        
-        # Set text position and duration
-        text_clip = text_clip.with_position('center').with_duration(duration)
-        
-        # Composite video clip
-        final_clip = CompositeVideoClip([background, text_clip])
-        
-        return final_clip
-    except Exception as e:
-        print(f"Error creating intro clip: {e}")
-        # Create a simple color clip as fallback
-        from moviepy import ColorClip
-        fallback_clip = ColorClip(size=(1920, 1080), color=(0, 0, 0), duration=duration)
-        text_clip = TextClip(text=topic, font_size=30, color='white').with_position('center').with_duration(duration)
-        return CompositeVideoClip([fallback_clip, text_clip])
+    check_file_exists(background_image_path)
+
+    # Create background clip
+    background = ImageClip(str(background_image_path)).with_duration(duration)
+
+    # Create text clip
+    text_clip = TextClip(
+        text=topic,
+        font_size=50,
+        color='white',
+        font=str(font_path),
+        stroke_color='black',
+        stroke_width=2
+    )
+
+    # Set text position and duration
+    text_clip = text_clip.with_position('center').with_duration(duration)
+
+    # Composite video clip
+    return CompositeVideoClip([background, text_clip])
 
 
 def create_placeholder_image(
@@ -207,6 +264,16 @@ def create_placeholder_image(
     Returns:
         Path to the generated placeholder image
     """
+    # One file per parameter set, under the system temp dir - distinct
+    # keys must not overwrite each other's bitmaps
+    cache_key = (width, height, text, str(font_path), font_size, text_color, bg_color)
+    key_hash = hashlib.sha1(repr(cache_key).encode()).hexdigest()[:12]
+    placeholder_path = Path(tempfile.gettempdir()) / f"placeholder_{key_hash}.png"
+
+    cached = _placeholder_cache.get(cache_key)
+    if cached is not None and cached.exists():
+        return cached
+
     try:
         img = Image.new("RGB", (width, height), bg_color)
         draw = ImageDraw.Draw(img)
@@ -228,14 +295,143 @@ def create_placeholder_image(
         draw.text(text_position, text, font=font, fill=text_color)
         
         # Save placeholder in temp location
-        placeholder_path = Path("placeholder_temp.png")
         img.save(placeholder_path)
-        
+
+        _placeholder_cache[cache_key] = placeholder_path
         return placeholder_path
     except Exception as e:
         print(f"Error creating placeholder: {e}")
         # Return a simple path
-        return Path("placeholder_temp.png")
+        return placeholder_path
+
+
+def _render_title_frame(
+    background_image_path: Path,
+    text: str,
+    font_path: Path,
+    output_path: Path,
+    size: tuple = (1920, 1080)
+) -> Path:
+    """Render a title card (background image + centered text) to a PNG."""
+    img = Image.open(background_image_path).convert("RGB").resize(size)
+    draw = ImageDraw.Draw(img)
+
+    if font_path and Path(font_path).exists():
+        font = ImageFont.truetype(str(font_path), 50)
+    else:
+        font = ImageFont.load_default()
+
+    bbox = draw.textbbox((0, 0), text, font=font)
+    position = ((size[0] - (bbox[2] - bbox[0])) // 2, (size[1] - (bbox[3] - bbox[1])) // 2)
+    draw.text(position, text, font=font, fill="white", stroke_width=2, stroke_fill="black")
+
+    img.save(output_path)
+    return output_path
+
+
+def _ffmpeg_segment(
+    image: Path,
+    audio: Optional[Path],
+    duration: float,
+    output_path: Path,
+    fps: int
+) -> None:
+    """Encode one still image (+ optional audio track) into an MP4 segment."""
+    cmd = ["ffmpeg", "-y", "-loglevel", "error", "-loop", "1", "-i", str(image)]
+    if audio is not None:
+        cmd += ["-i", str(audio)]
+    else:
+        # Silent track keeps the concat demuxer's stream layout uniform
+        cmd += ["-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono"]
+
+    fade_out_start = max(duration - 1.0, 0.0)
+    video_filter = (
+        "scale=1920:1080:force_original_aspect_ratio=decrease,"
+        "pad=1920:1080:(ow-iw)/2:(oh-ih)/2,"
+        f"fade=t=in:st=0:d=1,fade=t=out:st={fade_out_start:.3f}:d=1,"
+        "format=yuv420p"
+    )
+    cmd += [
+        "-t", f"{duration:.3f}", "-r", str(fps), "-vf", video_filter,
+        "-c:v", "libx264", "-preset", "ultrafast", "-tune", "stillimage",
+        "-c:a", "aac", "-ar", "24000",
+        str(output_path)
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def _create_video_ffmpeg(
+    images: List[Path],
+    audio_files: List[Path],
+    audio_folder: Path,
+    script_path: Path,
+    topic: str,
+    font_path: Path,
+    output_file: Path,
+    intro_image_path: Path,
+    with_subtitles: bool,
+    fps: int
+) -> bool:
+    """
+    Assemble the video directly with ffmpeg: encode each still+audio pair
+    as a segment, concatenate with the stream-copy concat demuxer, and
+    optionally burn subtitles in a final filter pass. Skips MoviePy's
+    frame-by-frame Python compositor entirely.
+    """
+    with tempfile.TemporaryDirectory(prefix="assembly_") as tmp:
+        tmp = Path(tmp)
+        segments = []
+
+        # Intro / outro title cards
+        intro_frame = _render_title_frame(intro_image_path, topic, font_path, tmp / "intro.png")
+        outro_frame = _render_title_frame(
+            intro_image_path, "MADE BY TEAM FRAGMENT", font_path, tmp / "outro.png"
+        )
+
+        segment_path = tmp / "seg_intro.mp4"
+        _ffmpeg_segment(intro_frame, None, 5.0, segment_path, fps)
+        segments.append(segment_path)
+
+        for idx, (img, audio) in enumerate(zip(images, audio_files)):
+            segment_path = tmp / f"seg_{idx}.mp4"
+            _ffmpeg_segment(img, audio, get_audio_duration(audio), segment_path, fps)
+            print(f"Video Clip no. {idx + 1} successfully created")
+            segments.append(segment_path)
+
+        segment_path = tmp / "seg_outro.mp4"
+        _ffmpeg_segment(outro_frame, None, 5.0, segment_path, fps)
+        segments.append(segment_path)
+
+        # Concatenate without re-encoding
+        concat_list = tmp / "segments.txt"
+        concat_list.write_text("".join(f"file '{seg}'\n" for seg in segments))
+        concat_output = tmp / "concat.mp4" if with_subtitles else output_file
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", str(concat_list),
+                "-c", "copy", str(concat_output)
+            ],
+            check=True
+        )
+
+        if with_subtitles:
+            # Burn subtitles in one re-encode pass over the concatenated video
+            srt_path = tmp / "subtitles.srt"
+            create_complete_srt(script_path, audio_folder, srt_path)
+            subprocess.run(
+                [
+                    "ffmpeg", "-y", "-loglevel", "error",
+                    "-i", str(concat_output),
+                    "-vf", f"subtitles={srt_path}",
+                    "-c:v", "libx264", "-preset", "ultrafast",
+                    "-c:a", "copy", str(output_file)
+                ],
+                check=True
+            )
+
+    print(f"Video created successfully: {output_file}")
+    return True
 
 
 def create_video(
@@ -293,20 +489,39 @@ def create_video(
         check_folder_exists(image_folder)
         images = get_files(image_folder, ('.jpg', '.png', '.jpeg'))
     
+    topic = extract_topic_from_json(script_path)
+
+    # Prefer the direct ffmpeg pipeline when the binary is available -
+    # it avoids pushing every frame through Python
+    if shutil.which("ffmpeg"):
+        try:
+            return _create_video_ffmpeg(
+                images, audio_files, audio_folder, script_path, topic,
+                font_path, output_file, intro_image_path, with_subtitles, fps
+            )
+        except Exception as e:
+            print(f"ffmpeg assembly failed, falling back to MoviePy: {e}")
+
     # Extract subtitles from script
     subtitles = json_extract(script_path)
     raw_clips = []
     audio_durations = []
-    
+
     # Create intro clip
-    topic = extract_topic_from_json(script_path)
     intro_clip = create_intro_clip(intro_image_path, duration=5, topic=topic, font_path=font_path)
     raw_clips.append(intro_clip)
     
-    # Create video clips with audio
+    # Create video clips with audio; cache the decoded frame per image
+    # path so the placeholder (used for every segment when no images
+    # exist) is only read once
+    image_clip_cache = {}
     for img, audio in zip(images, audio_files):
         audio_clip = AudioFileClip(str(audio))
-        image_clip = ImageClip(str(img)).with_duration(audio_clip.duration).with_audio(audio_clip)
+        base_clip = image_clip_cache.get(img)
+        if base_clip is None:
+            base_clip = ImageClip(str(img))
+            image_clip_cache[img] = base_clip
+        image_clip = base_clip.with_duration(audio_clip.duration).with_audio(audio_clip)
         audio_durations.append(audio_clip.duration)
         print(f"Video Clip no. {len(raw_clips)} successfully created")
         image_clip = add_effects(image_clip)
@@ -325,27 +540,16 @@ def create_video(
         Start_duration = 5
         subtitle_clips = []
         chunk_size = 10
-        for text, duration in zip(subtitles, audio_durations):
-            words = text.split()
-            if len(words) > chunk_size:
-                for i in range(0, len(words), chunk_size):
-                    chunk = " ".join(words[i:i + chunk_size])
-                    chunk_duration = duration * (len(chunk.split()) / len(words))
-                    subtitle_clip = TextClip(
-                        text=chunk,
-                        font=str(font_path),
-                        color='white',
-                        bg_color='black',
-                        size=(1000, 100),
-                        method='caption',
-                        text_align="center",
-                        horizontal_align="center"
-                    ).with_duration(chunk_duration).with_start(Start_duration).with_position('bottom')
-                    subtitle_clips.append(subtitle_clip)
-                    Start_duration += chunk_duration
-            else:
-                subtitle_clip = TextClip(
-                    text=text,
+
+        # Rendering text is the expensive part; cache the base clip per
+        # chunk text so repeated chunks are rasterized only once
+        text_clip_cache = {}
+
+        def render_subtitle(chunk_text: str) -> TextClip:
+            base = text_clip_cache.get(chunk_text)
+            if base is None:
+                base = TextClip(
+                    text=chunk_text,
                     font=str(font_path),
                     color='white',
                     bg_color='black',
@@ -353,7 +557,27 @@ def create_video(
                     method='caption',
                     text_align="center",
                     horizontal_align="center"
-                ).with_duration(duration).with_start(Start_duration).with_position('bottom')
+                )
+                text_clip_cache[chunk_text] = base
+            return base
+
+        for text, duration in zip(subtitles, audio_durations):
+            words = text.split()
+            if len(words) > chunk_size:
+                # Each word carries an equal share of the scene duration;
+                # compute it once instead of re-splitting every chunk
+                per_word = duration / len(words)
+                for i in range(0, len(words), chunk_size):
+                    chunk_words = words[i:i + chunk_size]
+                    chunk = " ".join(chunk_words)
+                    chunk_duration = per_word * len(chunk_words)
+                    subtitle_clip = render_subtitle(chunk) \
+                        .with_duration(chunk_duration).with_start(Start_duration).with_position('bottom')
+                    subtitle_clips.append(subtitle_clip)
+                    Start_duration += chunk_duration
+            else:
+                subtitle_clip = render_subtitle(text) \
+                    .with_duration(duration).with_start(Start_duration).with_position('bottom')
                 subtitle_clips.append(subtitle_clip)
                 Start_duration += duration
         subtitle_clips.insert(0, video)
@@ -361,8 +585,14 @@ def create_video(
     else:
         final_video = video
     
-    # Write video file
-    final_video.write_videofile(str(output_file), fps=fps, threads=os.cpu_count())
+    # Write video file - ultrafast trades a little bitrate for a much
+    # faster encode, which is the right call for still-image slideshows
+    final_video.write_videofile(
+        str(output_file),
+        fps=fps,
+        threads=os.cpu_count(),
+        preset="ultrafast"
+    )
     print(f"Video created successfully: {output_file}")
     return True
 
@@ -398,45 +628,53 @@ def create_complete_srt(
         script = json_extract(script_folder)
         audio_files = get_files(audio_file_folder, (".wav", ".mp3"))
         
-        audio_clips = [AudioFileClip(str(x)) for x in audio_files]
-        subs = pysrt.SubRipFile()
-        start_time = 5  # Account for intro
-        n = 1
-        
-        for text, audio_clip in zip(script, audio_clips):
-            duration = audio_clip.duration
+        scene_durations = np.asarray(
+            [get_audio_duration(x) for x in audio_files], dtype=np.float64
+        )
+
+        # Chunk all scene texts, recording per-chunk word counts and how
+        # many chunks each scene produced
+        chunk_texts = []
+        chunk_word_counts = []
+        scene_chunk_counts = []
+        scene_word_totals = []
+        for text in script:
             words = text.split()
-            
-            if len(words) > chunk_size:
-                for i in range(0, len(words), chunk_size):
-                    chunk = " ".join(words[i:min(i + chunk_size, len(words))])
-                    chunk_duration = duration * (len(chunk.split()) / len(words))
-                    end_time = start_time + chunk_duration
-                    
-                    subtitle = pysrt.SubRipItem(
-                        index=n,
-                        start=pysrt.SubRipTime(seconds=start_time),
-                        end=pysrt.SubRipTime(seconds=end_time),
-                        text=chunk
-                    )
-                    subs.append(subtitle)
-                    start_time = end_time
-                    n += 1
-            else:
-                chunk_duration = duration
-                end_time = start_time + chunk_duration
-                
-                subtitle = pysrt.SubRipItem(
-                    index=n,
-                    start=pysrt.SubRipTime(seconds=start_time),
-                    end=pysrt.SubRipTime(seconds=end_time),
-                    text=text
-                )
-                subs.append(subtitle)
-                start_time = end_time
-                n += 1
-        
-        subs.save(str(outfile_path), encoding='utf-8')
+            chunks = [
+                " ".join(words[i:i + chunk_size])
+                for i in range(0, len(words), chunk_size)
+            ] or [text]
+            chunk_texts.extend(chunks)
+            chunk_word_counts.extend(len(c.split()) or 1 for c in chunks)
+            scene_chunk_counts.append(len(chunks))
+            scene_word_totals.append(max(len(words), 1))
+
+        n_scenes = min(len(scene_durations), len(scene_chunk_counts))
+        scene_chunk_counts = scene_chunk_counts[:n_scenes]
+        n_chunks = sum(scene_chunk_counts)
+        chunk_texts = chunk_texts[:n_chunks]
+
+        # Weight each chunk by its share of the scene's total duration,
+        # then lay out the whole timeline with one cumulative sum offset
+        # by the 5s intro
+        word_counts = np.asarray(chunk_word_counts[:n_chunks], dtype=np.float64)
+        per_chunk_duration = np.repeat(scene_durations[:n_scenes], scene_chunk_counts)
+        per_chunk_total = np.repeat(
+            np.asarray(scene_word_totals[:n_scenes], dtype=np.float64), scene_chunk_counts
+        )
+        durations_arr = per_chunk_duration * word_counts / per_chunk_total
+        end_times = 5.0 + np.cumsum(durations_arr)
+        start_times = end_times - durations_arr
+
+        # Emit the SRT blocks directly as formatted strings - no
+        # per-subtitle pysrt object construction
+        blocks = [
+            f"{n}\n{_format_srt_time(start_time)} --> {_format_srt_time(end_time)}\n{chunk}\n"
+            for n, (chunk, start_time, end_time) in enumerate(
+                zip(chunk_texts, start_times, end_times), start=1
+            )
+        ]
+        outfile_path.write_text("\n".join(blocks), encoding='utf-8')
         print(f"Subtitle file saved successfully at {outfile_path}")
         return True
         
@@ -8,9 +8,14 @@ import os
 import time
 import requests
 import openai
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+# Shared session so image downloads reuse one keep-alive connection pool
+# instead of opening a fresh TCP/TLS connection per file
+_session = requests.Session()
+
 
 def download_image(url: str, file_path: Path) -> bool:
     """
@@ -24,18 +29,21 @@ def download_image(url: str, file_path: Path) -> bool:
         True if successful, False otherwise
     """
     try:
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            # Ensure parent directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-            print(f"Saved: {file_path}")
-            return True
-        else:
-            print(f"Failed to download image from {url}: Status {response.status_code}")
-            return False
+        with _session.get(url, timeout=30, stream=True) as response:
+            if response.status_code == 200:
+                # Ensure parent directory exists
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+
+                # Stream straight to disk instead of buffering the whole
+                # image body in memory first
+                with open(file_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+                print(f"Saved: {file_path}")
+                return True
+            else:
+                print(f"Failed to download image from {url}: Status {response.status_code}")
+                return False
     except Exception as e:
         print(f"Error downloading image: {e}")
         return False
@@ -125,43 +133,53 @@ def main_generate_images(
         print("Missing key 'visual_script' in JSON.")
         return False
 
-    # Process each scene
-    success_count = 0
+    # Collect scenes that have prompts
+    scenes = []
     for idx, scene in enumerate(data["visual_script"]):
-        try:
-            prompt = scene.get("prompt")
-            if not prompt:
-                print(f"Scene {idx}: Missing prompt, skipping")
-                continue
-            
-            timestamp = scene.get("timestamp_start", f"{idx:03d}")
-            scene_id = timestamp.replace(":", "-")
+        prompt = scene.get("prompt")
+        if not prompt:
+            print(f"Scene {idx}: Missing prompt, skipping")
+            continue
+        timestamp = scene.get("timestamp_start", f"{idx:03d}")
+        scenes.append((idx, prompt, timestamp.replace(":", "-")))
 
-            # Generate images using OpenAI DALL-E
+    if not scenes:
+        print("No scenes with prompts found.")
+        return False
+
+    # Generate images in parallel - each DALL-E call spends most of its
+    # time waiting on the API. Submissions are staggered by delay_seconds
+    # to stay under the rate limit. Downloads run on their own worker so
+    # fetching one scene's image overlaps with waiting on the next
+    # generation result.
+    with ThreadPoolExecutor(max_workers=min(4, len(scenes))) as executor, \
+            ThreadPoolExecutor(max_workers=1) as downloader:
+        futures = []
+        for idx, prompt, scene_id in scenes:
             print(f"Generating image for prompt: {prompt}")
-            image_urls = generate_openai_image(prompt, api_key, num_images=1)
-            
-            if not image_urls:
-                print(f"No images generated for prompt: {prompt}")
-                continue
+            futures.append(executor.submit(generate_openai_image, prompt, api_key, 1))
+            time.sleep(delay_seconds)
 
-            # Use the first generated image
-            image_url = image_urls[0]
-            if not image_url:
-                print(f"No suitable image generated for prompt: {prompt}")
-                continue
+        download_futures = []
+        for (idx, prompt, scene_id), future in zip(scenes, futures):
+            try:
+                image_urls = future.result()
 
-            # Download the generated image
-            file_path = images_output_path / f"scene_{scene_id}.jpg"
-            if download_image(image_url, file_path):
-                success_count += 1
+                if not image_urls or not image_urls[0]:
+                    print(f"No images generated for prompt: {prompt}")
+                    continue
 
-            # Rate limiting delay
-            time.sleep(delay_seconds)
+                # Queue the download without waiting for it to finish
+                file_path = images_output_path / f"scene_{scene_id}.jpg"
+                download_futures.append(
+                    downloader.submit(download_image, image_urls[0], file_path)
+                )
 
-        except Exception as e:
-            print(f"Error processing scene {idx}: {e}")
-            continue
+            except Exception as e:
+                print(f"Error processing scene {idx}: {e}")
+                continue
+
+        success_count = sum(1 for f in download_futures if f.result())
 
     print(f"Image generation completed. {success_count}/{len(data['visual_script'])} images generated.")
     return success_count > 0
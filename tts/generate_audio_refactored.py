@@ -4,78 +4,111 @@ Generates audio using Kokoro TTS pipeline
 All paths are passed as parameters - no hardcoded paths
 """
 import json
-import io
+import numpy as np
 import soundfile as sf
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 from kokoro.pipeline import KPipeline
 
+# One pipeline per language code, shared across invocations - KPipeline
+# construction loads the model weights, which dwarfs synthesis itself
+_pipelines: Dict[str, KPipeline] = {}
+
+
+def _get_pipeline(lang_code: str) -> KPipeline:
+    """Return the shared KPipeline for a language, creating it on first use."""
+    pipeline = _pipelines.get(lang_code)
+    if pipeline is None:
+        pipeline = KPipeline(lang_code=lang_code)
+        _pipelines[lang_code] = pipeline
+    return pipeline
+
+
+def _to_numpy(chunk) -> np.ndarray:
+    """Convert a Kokoro output chunk to a numpy array without extra copies."""
+    if hasattr(chunk, "detach"):
+        # Torch tensor: .numpy() shares memory with a CPU tensor, so this
+        # is zero-copy, unlike routing through np.asarray's __array__ path
+        return chunk.detach().cpu().numpy()
+    return np.asarray(chunk)
+
+
+def _synthesize_segment(pipeline: KPipeline, segment: Dict[str, Any]) -> np.ndarray:
+    """Synthesize one script segment to a sample array."""
+    # Map speaker to voice ID
+    speaker_id = "am_adam" if segment["speaker"] in ["default", "narrator_male"] else "af_heart"
+
+    # Generate audio
+    audio = pipeline(
+        text=segment["text"],
+        voice=speaker_id,
+        speed=segment.get("speed", 1.0)
+    )
+
+    # Concatenate the raw chunks into one sample array; WAV encoding
+    # happens once, straight to disk, in merge_audio
+    chunks = [_to_numpy(chunk) for _, _, chunk in audio]
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    if len(chunks) == 1:
+        return chunks[0]
+    return np.concatenate(chunks)
+
 
 def generate_audio(
     script_data: Dict[str, Any],
     lang_code: str = "b"
-) -> List[bytes]:
+) -> List[np.ndarray]:
     """
     Generate audio from script data using Kokoro TTS.
-    
+
     Args:
         script_data: Dictionary containing audio_script with segments
         lang_code: Language code for TTS (default: "b")
-        
+
     Returns:
-        List of audio bytes for each segment
+        List of sample arrays for each segment
     """
-    pipeline = KPipeline(lang_code=lang_code)
-        
-    all_audio = []
-    for segment in script_data["audio_script"]:
-        # Map speaker to voice ID
-        speaker_id = "am_adam" if segment["speaker"] in ["default", "narrator_male"] else "af_heart"
-        
-        # Generate audio
-        audio = pipeline(
-            text=segment["text"],
-            voice=speaker_id,
-            speed=segment.get("speed", 1.0)
-        )
-        
-        # Collect audio chunks
-        buffer = io.BytesIO()
-        for _, _, chunk in audio:
-            sf.write(buffer, chunk, 24000, format='WAV')
-        buffer.seek(0)
-        all_audio.append(buffer.read())
-    
-    return all_audio
+    pipeline = _get_pipeline(lang_code)
+
+    segments = script_data["audio_script"]
+    if not segments:
+        return []
+
+    # Synthesize segments in parallel; torch inference releases the GIL,
+    # and executor.map keeps the results in script order
+    with ThreadPoolExecutor(max_workers=min(4, len(segments))) as executor:
+        return list(executor.map(lambda seg: _synthesize_segment(pipeline, seg), segments))
 
 
 def merge_audio(
     audio_path: Path,
-    audio_bytes_list: List[bytes]
+    audio_samples_list: List[np.ndarray]
 ) -> List[Path]:
     """
     Save audio segments to individual files.
-    
+
     Args:
         audio_path: Directory where audio files should be saved
-        audio_bytes_list: List of audio data as bytes
-        
+        audio_samples_list: List of audio sample arrays
+
     Returns:
         List of paths to saved audio files
     """
     # Ensure output directory exists
     audio_path = Path(audio_path)
     audio_path.mkdir(parents=True, exist_ok=True)
-    
+
     audio_files = []
-    for idx, audio_bytes in enumerate(audio_bytes_list):
+    for idx, samples in enumerate(audio_samples_list):
         output_path = audio_path / f"segment_{idx}.wav"
-        with open(output_path, "wb") as f:
-            f.write(audio_bytes)
+        # Encode directly to the file - no intermediate BytesIO
+        sf.write(output_path, samples, 24000, format='WAV')
         audio_files.append(output_path)
         print(f"Audio file: {idx} successfully saved at: {output_path}")
-    
+
     return audio_files
 
 
@@ -114,10 +147,10 @@ def main_generate_audio(
     
     # Generate audio
     print(f"Generating audio from script: {script_path}")
-    audio_bytes_list = generate_audio(script_data, lang_code)
-    
+    audio_samples_list = generate_audio(script_data, lang_code)
+
     # Save audio files
-    audio_files = merge_audio(audio_path, audio_bytes_list)
+    audio_files = merge_audio(audio_path, audio_samples_list)
     
     print(f"Audio generation complete! Generated {len(audio_files)} files in {audio_path}")
     return audio_files